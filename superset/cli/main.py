@@ -17,46 +17,187 @@
 # under the License.
 import importlib
 import logging
-import pkgutil
-from typing import Any
+import sys
+from typing import Any, NamedTuple, Optional
 
 import click
 from colorama import Fore, Style
 from flask.cli import FlaskGroup, with_appcontext
 
-from superset import app, appbuilder, cli, security_manager
+from superset import app, appbuilder, security_manager
 from superset.cli.lib import normalize_token
 from superset.extensions import db
 
 logger = logging.getLogger(__name__)
 
+# ``click.Context.meta`` key telling whether the help of a sub-command is requested
+HELP_REQUESTED = "superset.help_requested"
+# ``click.Context.meta`` key telling whether the group is listing its sub-commands
+LISTING_COMMANDS = "superset.listing_commands"
+
+
+class SubCommand(NamedTuple):
+    # ``module:attribute`` path of the Click command
+    import_path: str
+    # help listed by ``superset --help``, kept in sync with the command's docstring
+    short_help: str
+
+
+# Sub-commands registered lazily. Their module is only imported when the command
+# is resolved to be invoked, or to print its own help.
+SUB_COMMANDS: dict[str, SubCommand] = {
+    "compute-thumbnails": SubCommand(
+        "superset.cli.thumbnails:compute_thumbnails", "Compute thumbnails"
+    ),
+    "export-dashboards": SubCommand(
+        "superset.cli.importexport:export_dashboards", "Export dashboards to ZIP file"
+    ),
+    "export-datasources": SubCommand(
+        "superset.cli.importexport:export_datasources", "Export datasources to ZIP file"
+    ),
+    "import-dashboards": SubCommand(
+        "superset.cli.importexport:import_dashboards", "Import dashboards from ZIP file"
+    ),
+    "import-datasources": SubCommand(
+        "superset.cli.importexport:import_datasources",
+        "Import datasources from ZIP file",
+    ),
+    "import-directory": SubCommand(
+        "superset.cli.importexport:import_directory",
+        "Imports configs from a given directory",
+    ),
+    "legacy-export-dashboards": SubCommand(
+        "superset.cli.importexport:legacy_export_dashboards",
+        "Export dashboards to JSON",
+    ),
+    "legacy-export-datasource-schema": SubCommand(
+        "superset.cli.importexport:legacy_export_datasource_schema",
+        "Export datasource YAML schema to stdout",
+    ),
+    "legacy-export-datasources": SubCommand(
+        "superset.cli.importexport:legacy_export_datasources",
+        "Export datasources to YAML",
+    ),
+    "legacy-import-dashboards": SubCommand(
+        "superset.cli.importexport:legacy_import_dashboards",
+        "Import dashboards from JSON file",
+    ),
+    "legacy-import-datasources": SubCommand(
+        "superset.cli.importexport:legacy_import_datasources",
+        "Import datasources from YAML",
+    ),
+    "load-examples": SubCommand(
+        "superset.cli.examples:load_examples",
+        "Loads a set of Slices and Dashboards and a supporting dataset",
+    ),
+    "load-test-users": SubCommand(
+        "superset.cli.test:load_test_users",
+        "Loads admin, alpha, and gamma user for testing purposes",
+    ),
+    "migrate-viz": SubCommand(
+        "superset.cli.viz_migrations:migrate_viz",
+        "Migrate a viz from one type to another.",
+    ),
+    "re-encrypt-secrets": SubCommand("superset.cli.update:re_encrypt_secrets", ""),
+    "set-database-uri": SubCommand(
+        "superset.cli.update:set_database_uri", "Updates a database connection URI"
+    ),
+    "sync-tags": SubCommand(
+        "superset.cli.update:sync_tags",
+        "Rebuilds special tags (owner, type, favorited by).",
+    ),
+    "test-db": SubCommand(
+        "superset.cli.test_db:test_db",
+        "Run a series of tests against an analytical database.",
+    ),
+    "update-api-docs": SubCommand(
+        "superset.cli.update:update_api_docs",
+        "Regenerate the openapi.json file in docs",
+    ),
+}
+
+
+class SupersetGroup(FlaskGroup):
+    """
+    Flask group resolving the sub-commands in ``SUB_COMMANDS`` on demand, instead
+    of importing every module in the ``superset.cli`` package upfront.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *SUB_COMMANDS})
+
+    def get_command(self, ctx: click.Context, name: str) -> Optional[click.Command]:
+        if sub_command := SUB_COMMANDS.get(name):
+            if ctx.meta.get(LISTING_COMMANDS):
+                # Listing the commands only needs their help, take it from the
+                # registry rather than importing the module
+                return click.Command(name, help=sub_command.short_help)
+            module_name, attribute = sub_command.import_path.split(":")
+            return getattr(importlib.import_module(module_name), attribute)
+        return super().get_command(ctx, name)
+
+    def format_commands(
+        self,
+        ctx: click.Context,
+        formatter: click.HelpFormatter,
+    ) -> None:
+        ctx.meta[LISTING_COMMANDS] = True
+        try:
+            super().format_commands(ctx, formatter)
+        finally:
+            del ctx.meta[LISTING_COMMANDS]
+
+    def invoke(self, ctx: click.Context) -> Any:
+        if args := [*ctx.protected_args, *ctx.args]:
+            _, command, command_args = self.resolve_command(ctx, args)
+            ctx.meta[HELP_REQUESTED] = command is not None and is_help_requested(
+                ctx, command, command_args
+            )
+        return super().invoke(ctx)
+
+
+def is_help_requested(
+    ctx: click.Context,
+    command: click.Command,
+    args: list[str],
+) -> bool:
+    """
+    Whether the arguments ask for the help of the command, which Click prints
+    when parsing them, before running the command.
+    """
+    command_ctx = click.Context(command, parent=ctx)
+    if not (help_option := command.get_help_option(command_ctx)):
+        return False
+
+    parser = command.make_parser(command_ctx)
+    try:
+        values, _, _ = parser.parse_args(list(args))
+    except click.UsageError:
+        # let the command itself report the error
+        return False
+    return bool(values.get(help_option.name))
+
 
 @click.group(
-    cls=FlaskGroup,
+    cls=SupersetGroup,
     context_settings={"token_normalize_func": normalize_token},
 )
-@with_appcontext
-def superset() -> None:
+@click.pass_context
+def superset(ctx: click.Context) -> None:
     """This is a management script for the Superset application."""
+    # Printing the help of a sub-command doesn't need the application, so avoid
+    # building it just to render the usage
+    if not ctx.meta.get(HELP_REQUESTED):
+        ctx.invoke(setup_app_context)
 
+
+@with_appcontext
+def setup_app_context() -> None:
     @app.shell_context_processor
     def make_shell_context() -> dict[str, Any]:
         return {"app": app, "db": db}
 
 
-# add sub-commands
-for load, module_name, is_pkg in pkgutil.walk_packages(
-    cli.__path__, cli.__name__ + "."
-):
-    module = importlib.import_module(module_name)
-    for attribute in module.__dict__.values():
-        if isinstance(attribute, (click.core.Command, click.core.Group)):
-            superset.add_command(attribute)
-
-            if isinstance(attribute, click.core.Group):
-                break
-
-
 @superset.command()
 @with_appcontext
 def init() -> None:
@@ -70,9 +211,15 @@ def init() -> None:
 @click.option("--verbose", "-v", is_flag=True, help="Show extra information")
 def version(verbose: bool) -> None:
     """Prints the current version number"""
-    print(Fore.BLUE + "-=" * 15)
-    print(Fore.YELLOW + "Superset " + Fore.CYAN + f"{app.config['VERSION_STRING']}")
-    print(Fore.BLUE + "-=" * 15)
+    separator = Fore.BLUE + "-=" * 15 + "\n"
+    output = (
+        separator
+        + Fore.YELLOW
+        + "Superset "
+        + Fore.CYAN
+        + f"{app.config['VERSION_STRING']}\n"
+        + separator
+    )
     if verbose:
-        print("[DB] : " + f"{db.engine}")
-    print(Style.RESET_ALL)
+        output += f"[DB] : {db.engine}\n"
+    sys.stdout.write(output + Style.RESET_ALL + "\n")
@@ -19,8 +19,8 @@ from __future__ import annotations
 import contextlib
 import logging
 import threading
-import time
-from typing import Any, TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, ClassVar, TYPE_CHECKING
 
 import simplejson as json
 from flask import current_app
@@ -29,7 +29,12 @@ from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import NoSuchTableError
 
 from superset import db
-from superset.constants import QUERY_CANCEL_KEY, QUERY_EARLY_CANCEL_KEY, USER_AGENT
+from superset.constants import (
+    LRU_CACHE_MAX_SIZE,
+    QUERY_CANCEL_KEY,
+    QUERY_EARLY_CANCEL_KEY,
+    USER_AGENT,
+)
 from superset.databases.utils import make_url_safe
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.db_engine_specs.exceptions import (
@@ -51,12 +56,24 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Authentication methods supported out of the box, mapped to their `trino.auth` class
+TRINO_AUTH_CLASS_NAMES = {
+    "basic": "BasicAuthentication",
+    "kerberos": "KerberosAuthentication",
+    "certificate": "CertificateAuthentication",
+    "jwt": "JWTAuthentication",
+}
+
 
 class TrinoEngineSpec(PrestoBaseEngineSpec):
     engine = "trino"
     engine_name = "Trino"
     allows_alias_to_source_column = False
 
+    _dbapi_exception_mapping: ClassVar[
+        dict[type[Exception], type[Exception]] | None
+    ] = None
+
     @classmethod
     def extra_table_metadata(
         cls,
@@ -78,17 +95,13 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
             if not latest_parts:
                 latest_parts = tuple([None] * len(col_names))
 
+            partition_cols: set[str] = set()
+            for index in indexes:
+                if index.get("name") == "partition":
+                    partition_cols.update(index.get("column_names") or ())
+
             metadata["partitions"] = {
-                "cols": sorted(
-                    list(
-                        {
-                            column_name
-                            for index in indexes
-                            if index.get("name") == "partition"
-                            for column_name in index.get("column_names", [])
-                        }
-                    )
-                ),
+                "cols": sorted(partition_cols),
                 "latest": dict(zip(col_names, latest_parts)),
                 "partitionQuery": cls._partition_query(
                     table_name=table_name,
@@ -98,11 +111,20 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
                 ),
             }
 
-        if database.has_view_by_name(table_name, schema_name):
-            with database.get_inspector_with_context() as inspector:
-                metadata["view"] = inspector.get_view_definition(
-                    table_name, schema_name
-                )
+            # only tables can be partitioned, so there's no view definition to fetch
+            return metadata
+
+        # fetching the definition directly also tells whether the table is a view,
+        # which saves listing all the views in the schema beforehand
+        with database.get_inspector_with_context() as inspector:
+            try:
+                if view := inspector.get_view_definition(table_name, schema_name):
+                    metadata["view"] = view
+            except NoSuchTableError:
+                # not a view
+                pass
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Get view definition failed", exc_info=True)
 
         return metadata
 
@@ -178,7 +200,9 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
         # Adds the executed query id to the extra payload so the query can be cancelled
         cancel_query_id = cursor.query_id
         logger.debug("Query %d: queryId %s found in cursor", query.id, cancel_query_id)
-        query.set_extra_json_key(key=QUERY_CANCEL_KEY, value=cancel_query_id)
+        extra = query.extra
+        extra[QUERY_CANCEL_KEY] = cancel_query_id
+        query.extra = extra
 
         if tracking_url := cls.get_tracking_url(cursor):
             query.tracking_url = tracking_url
@@ -187,7 +211,7 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
         # if query cancelation was requested prior to the handle_cursor call, but
         # the query was still executed, trigger the actual query cancelation now
-        if query.extra.get(QUERY_EARLY_CANCEL_KEY):
+        if extra.get(QUERY_EARLY_CANCEL_KEY):
             cls.cancel_query(
                 cursor=cursor,
                 query=query,
@@ -235,8 +259,10 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
         # Wait for a query ID to be available before handling the cursor, as
         # it's required by that method; it may never become available on error.
-        while not cursor.query_id and not execute_event.is_set():
-            time.sleep(0.1)
+        # Waiting on the event instead of sleeping stops polling as soon as the
+        # execution finishes.
+        while not cursor.query_id and not execute_event.wait(timeout=0.1):
+            pass
 
         logger.debug("Query %d: Handling cursor", query_id)
         cls.handle_cursor(cursor, query)
@@ -252,8 +278,10 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
     @classmethod
     def prepare_cancel_query(cls, query: Query) -> None:
-        if QUERY_CANCEL_KEY not in query.extra:
-            query.set_extra_json_key(QUERY_EARLY_CANCEL_KEY, True)
+        extra = query.extra
+        if QUERY_CANCEL_KEY not in extra:
+            extra[QUERY_EARLY_CANCEL_KEY] = True
+            query.extra = extra
             db.session.commit()
 
     @classmethod
@@ -267,9 +295,11 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
         :return: True if query cancelled successfully, False otherwise
         """
         try:
+            # Bind the id as a parameter to keep it out of the SQL text
             cursor.execute(
-                f"CALL system.runtime.kill_query(query_id => '{cancel_query_id}',"
-                "message => 'Query cancelled by Superset')"
+                "CALL system.runtime.kill_query(query_id => ?,"
+                "message => 'Query cancelled by Superset')",
+                [cancel_query_id],
             )
             cursor.fetchall()  # needed to trigger the call
         except Exception:  # pylint: disable=broad-except
@@ -314,15 +344,11 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
             connect_args = params.setdefault("connect_args", {})
             connect_args["http_scheme"] = "https"
-            # pylint: disable=import-outside-toplevel
-            if auth_method == "basic":
-                from trino.auth import BasicAuthentication as trino_auth  # noqa
-            elif auth_method == "kerberos":
-                from trino.auth import KerberosAuthentication as trino_auth  # noqa
-            elif auth_method == "certificate":
-                from trino.auth import CertificateAuthentication as trino_auth  # noqa
-            elif auth_method == "jwt":
-                from trino.auth import JWTAuthentication as trino_auth  # noqa
+            if auth_class_name := TRINO_AUTH_CLASS_NAMES.get(auth_method):
+                # pylint: disable=import-outside-toplevel
+                from trino import auth
+
+                trino_auth = getattr(auth, auth_class_name)
             else:
                 allowed_extra_auths = current_app.config[
                     "ALLOWED_EXTRA_AUTHENTICATIONS"
@@ -342,6 +368,9 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
     @classmethod
     def get_dbapi_exception_mapping(cls) -> dict[type[Exception], type[Exception]]:
+        if cls._dbapi_exception_mapping is not None:
+            return cls._dbapi_exception_mapping
+
         # pylint: disable=import-outside-toplevel
         from requests import exceptions as requests_exceptions
         from trino import exceptions as trino_exceptions
@@ -364,7 +393,8 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
                     return SupersetDBAPIProgrammingError
                 return default
 
-        return _CustomMapping()
+        cls._dbapi_exception_mapping = _CustomMapping()
+        return cls._dbapi_exception_mapping
 
     @classmethod
     def _expand_columns(cls, col: ResultSetColumnType) -> list[ResultSetColumnType]:
@@ -395,20 +425,27 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
             outer_name = col["name"]
             name = ".".join([outer_name, inner_name])
             query_name = ".".join([f'"{piece}"' for piece in name.split(".")])
-            column_spec = cls.get_column_spec(str(inner_type))
-            is_dttm = column_spec.is_dttm if column_spec else False
-
             inner_col = ResultSetColumnType(
                 name=name,
                 column_name=name,
                 type=inner_type,
-                is_dttm=is_dttm,
+                is_dttm=cls._is_dttm_type(str(inner_type)),
                 query_as=f'{query_name} AS "{name}"',
             )
             cols.extend(cls._expand_columns(inner_col))
 
         return cols
 
+    @classmethod
+    @lru_cache(maxsize=LRU_CACHE_MAX_SIZE)
+    def _is_dttm_type(cls, native_type: str) -> bool:
+        """
+        Return whether the native type is temporal, memoized as wide tables tend to
+        repeat the same few field types across their nested ROWs.
+        """
+        column_spec = cls.get_column_spec(native_type)
+        return column_spec.is_dttm if column_spec else False
+
     @classmethod
     def get_columns(
         cls,
@@ -122,6 +122,8 @@ InputType = TypeVar("InputType")  # pylint: disable=invalid-name
 
 ADHOC_FILTERS_REGEX = re.compile("^adhoc_filters")
 
+EMAIL_ADDRESS_SEPARATOR_REGEX = re.compile(r"[,\s;]+")
+
 
 class AdhocMetricExpressionType(StrEnum):
     SIMPLE = "SIMPLE"
@@ -943,10 +945,9 @@ def send_mime_email(
 
 
 def get_email_address_list(address_string: str) -> list[str]:
-    address_string_list: list[str] = []
-    if isinstance(address_string, str):
-        address_string_list = re.split(r",|\s|;", address_string)
-    return [x.strip() for x in address_string_list if x.strip()]
+    if not isinstance(address_string, str):
+        return []
+    return [x for x in EMAIL_ADDRESS_SEPARATOR_REGEX.split(address_string) if x]
 
 
 def choicify(values: Iterable[Any]) -> list[tuple[Any, Any]]:
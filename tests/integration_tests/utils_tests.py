@@ -20,13 +20,13 @@ from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 import json
 import os
-import re
+from collections.abc import Iterator
 from typing import Any, Optional
 from unittest.mock import Mock, patch
 
 from superset.commands.database.exceptions import DatabaseInvalidError
 from tests.integration_tests.fixtures.birth_names_dashboard import (
-    load_birth_names_dashboard_with_slices,
+    load_birth_names_dashboard_with_slices_module_scope,
     load_birth_names_data,
 )
 
@@ -34,10 +34,10 @@ import numpy as np
 import pandas as pd
 import pytest
 from flask import Flask, g
-import marshmallow
+from flask.ctx import AppContext
+from flask.testing import FlaskClient
 from sqlalchemy.exc import ArgumentError
 
-import tests.integration_tests.test_app
 from superset import app, db, security_manager
 from superset.constants import NO_TIME_RANGE
 from superset.exceptions import CertificateException, SupersetException
@@ -46,16 +46,11 @@ from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.utils.core import (
     base_json_conv,
-    cast_to_num,
-    convert_legacy_filters_into_adhoc,
     create_ssl_cert_file,
     DTTM_ALIAS,
     extract_dataframe_dtypes,
     format_timedelta,
     GenericDataType,
-    get_form_data_token,
-    as_list,
-    get_email_address_list,
     get_stacktrace,
     json_int_dttm_ser,
     json_iso_dttm_ser,
@@ -65,18 +60,15 @@ from superset.utils.core import (
     normalize_dttm_col,
     parse_ssl_cert,
     parse_js_uri_path_item,
-    split,
     validate_json,
     zlib_compress,
     zlib_decompress,
     DateColumn,
 )
 from superset.utils.database import get_or_create_db
-from superset.utils import schema
 from superset.utils.hashing import md5_sha_from_str
 from superset.views.utils import build_extra_filters, get_form_data
-from tests.integration_tests.base_tests import SupersetTestCase
-from tests.integration_tests.constants import ADMIN_USERNAME
+from tests.integration_tests.base_tests import get_resp, SupersetTestCase
 from tests.integration_tests.fixtures.world_bank_dashboard import (
     load_world_bank_dashboard_with_slices,
     load_world_bank_data,
@@ -84,6 +76,61 @@ from tests.integration_tests.fixtures.world_bank_dashboard import (
 
 from .fixtures.certificates import ssl_certificate
 
+PARSED_SSL_CERTIFICATE = parse_ssl_cert(ssl_certificate)
+SSL_CERTIFICATE_FILENAME = md5_sha_from_str(ssl_certificate)
+FORM_DATA_FOO = json.dumps({"foo": "bar"})
+FORM_DATA_BAZ = json.dumps({"baz": "bar"})
+FORM_DATA_QUERIES = json.dumps({"queries": [{"url_params": {"foo": "bar"}}]})
+
+# column name, expected generic type and values of the frame used to test
+# `extract_dataframe_dtypes`
+DATAFRAME_DTYPES_COLUMNS: tuple[tuple[str, GenericDataType, list[Any]], ...] = (
+    ("dt", GenericDataType.TEMPORAL, [date(2021, 2, 4), date(2021, 2, 4)]),
+    (
+        "dttm",
+        GenericDataType.TEMPORAL,
+        [datetime(2021, 2, 4, 1, 1, 1), datetime(2021, 2, 4, 1, 1, 1)],
+    ),
+    ("str", GenericDataType.STRING, ["foo", "foo"]),
+    ("int", GenericDataType.NUMERIC, [1, 1]),
+    ("float", GenericDataType.NUMERIC, [0.5, 0.5]),
+    ("mixed-int-float", GenericDataType.NUMERIC, [0.5, 1.0]),
+    ("bool", GenericDataType.BOOLEAN, [True, False]),
+    ("mixed-str-int", GenericDataType.STRING, ["abc", 1.0]),
+    ("obj", GenericDataType.STRING, [{"a": 1}, {"a": 1}]),
+    ("dt_null", GenericDataType.TEMPORAL, [None, date(2021, 2, 4)]),
+    (
+        "dttm_null",
+        GenericDataType.TEMPORAL,
+        [None, datetime(2021, 2, 4, 1, 1, 1)],
+    ),
+    ("str_null", GenericDataType.STRING, [None, "foo"]),
+    ("int_null", GenericDataType.NUMERIC, [None, 1]),
+    ("float_null", GenericDataType.NUMERIC, [None, 0.5]),
+    ("bool_null", GenericDataType.BOOLEAN, [None, False]),
+    ("obj_null", GenericDataType.STRING, [None, {"a": 1}]),
+    # Non-timestamp columns should be identified as temporal if
+    # `is_dttm` is set to `True` in the underlying datasource
+    ("ds", GenericDataType.TEMPORAL, [None, {"ds": "2017-01-01"}]),
+)
+DATAFRAME_DTYPES_DF = pd.DataFrame(
+    data={col[0]: col[2] for col in DATAFRAME_DTYPES_COLUMNS}
+)
+DATAFRAME_DTYPES_EXPECTED = [col[1] for col in DATAFRAME_DTYPES_COLUMNS]
+
+# frames used to test `normalize_dttm_col`, which are copied before being normalized
+NORMALIZE_DTTM_TIMESTAMP = pd.Timestamp(2021, 2, 15, 19, 0, 0, 0)
+NORMALIZE_DTTM_DF = pd.DataFrame({"__timestamp": [NORMALIZE_DTTM_TIMESTAMP], "a": [1]})
+NORMALIZE_DTTM_EPOCH_S_DF = pd.DataFrame(
+    {"__timestamp": [NORMALIZE_DTTM_TIMESTAMP.timestamp()], "a": [1]}
+)
+NORMALIZE_DTTM_EPOCH_MS_DF = pd.DataFrame(
+    {"__timestamp": [NORMALIZE_DTTM_TIMESTAMP.timestamp() * 1000], "a": [1]}
+)
+NORMALIZE_DTTM_OUT_OF_BOUNDS_DF = pd.DataFrame(
+    {"__timestamp": ["1677-09-21 00:00:00"], "a": [1]}
+)
+
 
 class TestUtils(SupersetTestCase):
     def test_json_int_dttm_ser(self):
@@ -96,7 +143,7 @@ class TestUtils(SupersetTestCase):
         assert json_int_dttm_ser(dttm + timedelta(milliseconds=1)) == (ts + 1)
         assert json_int_dttm_ser(np.int64(1)) == 1
 
-        with self.assertRaises(TypeError):
+        with pytest.raises(TypeError):
             json_int_dttm_ser(np.datetime64())
 
     def test_json_iso_dttm_ser(self):
@@ -113,7 +160,7 @@ class TestUtils(SupersetTestCase):
             == "Unserializable [<class 'numpy.datetime64'>]"
         )
 
-        with self.assertRaises(TypeError):
+        with pytest.raises(TypeError):
             json_iso_dttm_ser(np.datetime64())
 
     def test_base_json_conv(self):
@@ -136,14 +183,14 @@ class TestUtils(SupersetTestCase):
         json_str = '{"test": 1}'
         blob = zlib_compress(json_str)
         got_str = zlib_decompress(blob)
-        self.assertEqual(json_str, got_str)
+        assert json_str == got_str
 
     def test_merge_extra_filters(self):
         # does nothing if no extra filters
         form_data = {"A": 1, "B": 2, "c": "test"}
         expected = {**form_data, "adhoc_filters": [], "applied_time_extras": {}}
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
         # empty extra_filters
         form_data = {"A": 1, "B": 2, "c": "test", "extra_filters": []}
         expected = {
@@ -154,7 +201,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
         # copy over extra filters into empty filters
         form_data = {
             "extra_filters": [
@@ -186,7 +233,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
         # adds extra filters to existing filters
         form_data = {
             "extra_filters": [
@@ -234,7 +281,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
         # adds extra filters to existing filters and sets time options
         form_data = {
             "extra_filters": [
@@ -266,7 +313,7 @@ class TestUtils(SupersetTestCase):
             },
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_ignores_empty_filters(self):
         form_data = {
@@ -277,7 +324,7 @@ class TestUtils(SupersetTestCase):
         }
         expected = {"adhoc_filters": [], "applied_time_extras": {}}
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_ignores_nones(self):
         form_data = {
@@ -305,7 +352,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_ignores_equal_filters(self):
         form_data = {
@@ -365,7 +412,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_merges_different_val_types(self):
         form_data = {
@@ -419,7 +466,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
         form_data = {
             "extra_filters": [
                 {"col": "a", "op": "in", "val": "someval"},
@@ -471,7 +518,7 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_adds_unequal_lists(self):
         form_data = {
@@ -534,27 +581,24 @@ class TestUtils(SupersetTestCase):
             "applied_time_extras": {},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(form_data, expected)
+        assert form_data == expected
 
     def test_merge_extra_filters_when_applied_time_extras_predefined(self):
         form_data = {"applied_time_extras": {"__time_range": "Last week"}}
         merge_extra_filters(form_data)
 
-        self.assertEqual(
-            form_data,
-            {
-                "applied_time_extras": {"__time_range": "Last week"},
-                "adhoc_filters": [],
-            },
-        )
+        assert form_data == {
+            "applied_time_extras": {"__time_range": "Last week"},
+            "adhoc_filters": [],
+        }
 
     def test_merge_request_params_when_url_params_undefined(self):
         form_data = {"since": "2000", "until": "now"}
         url_params = {"form_data": form_data, "dashboard_ids": "(1,2,3,4,5)"}
         merge_request_params(form_data, url_params)
-        self.assertIn("url_params", form_data.keys())
-        self.assertIn("dashboard_ids", form_data["url_params"])
-        self.assertNotIn("form_data", form_data.keys())
+        assert "url_params" in form_data.keys()
+        assert "dashboard_ids" in form_data["url_params"]
+        assert "form_data" not in form_data.keys()
 
     def test_merge_request_params_when_url_params_predefined(self):
         form_data = {
@@ -564,125 +608,45 @@ class TestUtils(SupersetTestCase):
         }
         url_params = {"form_data": form_data, "dashboard_ids": "(1,2,3,4,5)"}
         merge_request_params(form_data, url_params)
-        self.assertIn("url_params", form_data.keys())
-        self.assertIn("abc", form_data["url_params"])
-        self.assertEqual(
-            url_params["dashboard_ids"], form_data["url_params"]["dashboard_ids"]
-        )
+        assert "url_params" in form_data.keys()
+        assert "abc" in form_data["url_params"]
+        assert url_params["dashboard_ids"] == form_data["url_params"]["dashboard_ids"]
 
     def test_format_timedelta(self):
-        self.assertEqual(format_timedelta(timedelta(0)), "0:00:00")
-        self.assertEqual(format_timedelta(timedelta(days=1)), "1 day, 0:00:00")
-        self.assertEqual(format_timedelta(timedelta(minutes=-6)), "-0:06:00")
-        self.assertEqual(
-            format_timedelta(timedelta(0) - timedelta(days=1, hours=5, minutes=6)),
-            "-1 day, 5:06:00",
+        assert format_timedelta(timedelta(0)) == "0:00:00"
+        assert format_timedelta(timedelta(days=1)) == "1 day, 0:00:00"
+        assert format_timedelta(timedelta(minutes=-6)) == "-0:06:00"
+        assert (
+            format_timedelta(timedelta(0) - timedelta(days=1, hours=5, minutes=6))
+            == "-1 day, 5:06:00"
         )
-        self.assertEqual(
-            format_timedelta(timedelta(0) - timedelta(days=16, hours=4, minutes=3)),
-            "-16 days, 4:03:00",
+        assert (
+            format_timedelta(timedelta(0) - timedelta(days=16, hours=4, minutes=3))
+            == "-16 days, 4:03:00"
         )
 
     def test_validate_json(self):
         valid = '{"a": 5, "b": [1, 5, ["g", "h"]]}'
-        self.assertIsNone(validate_json(valid))
+        assert validate_json(valid) is None
         invalid = '{"a": 5, "b": [1, 5, ["g", "h]]}'
-        with self.assertRaises(SupersetException):
+        with pytest.raises(SupersetException):
             validate_json(invalid)
 
-    def test_convert_legacy_filters_into_adhoc_where(self):
-        form_data = {"where": "a = 1"}
-        expected = {
-            "adhoc_filters": [
-                {
-                    "clause": "WHERE",
-                    "expressionType": "SQL",
-                    "filterOptionName": "46fb6d7891e23596e42ae38da94a57e0",
-                    "sqlExpression": "a = 1",
-                }
-            ]
-        }
-        convert_legacy_filters_into_adhoc(form_data)
-        self.assertEqual(form_data, expected)
-
-    def test_convert_legacy_filters_into_adhoc_filters(self):
-        form_data = {"filters": [{"col": "a", "op": "in", "val": "someval"}]}
-        expected = {
-            "adhoc_filters": [
-                {
-                    "clause": "WHERE",
-                    "comparator": "someval",
-                    "expressionType": "SIMPLE",
-                    "filterOptionName": "135c7ee246666b840a3d7a9c3a30cf38",
-                    "operator": "in",
-                    "subject": "a",
-                }
-            ]
-        }
-        convert_legacy_filters_into_adhoc(form_data)
-        self.assertEqual(form_data, expected)
-
-    def test_convert_legacy_filters_into_adhoc_present_and_empty(self):
-        form_data = {"adhoc_filters": [], "where": "a = 1"}
-        expected = {
-            "adhoc_filters": [
-                {
-                    "clause": "WHERE",
-                    "expressionType": "SQL",
-                    "filterOptionName": "46fb6d7891e23596e42ae38da94a57e0",
-                    "sqlExpression": "a = 1",
-                }
-            ]
-        }
-        convert_legacy_filters_into_adhoc(form_data)
-        self.assertEqual(form_data, expected)
-
-    def test_convert_legacy_filters_into_adhoc_having(self):
-        form_data = {"having": "COUNT(1) = 1"}
-        expected = {
-            "adhoc_filters": [
-                {
-                    "clause": "HAVING",
-                    "expressionType": "SQL",
-                    "filterOptionName": "683f1c26466ab912f75a00842e0f2f7b",
-                    "sqlExpression": "COUNT(1) = 1",
-                }
-            ]
-        }
-        convert_legacy_filters_into_adhoc(form_data)
-        self.assertEqual(form_data, expected)
-
-    def test_convert_legacy_filters_into_adhoc_present_and_nonempty(self):
-        form_data = {
-            "adhoc_filters": [
-                {"clause": "WHERE", "expressionType": "SQL", "sqlExpression": "a = 1"}
-            ],
-            "filters": [{"col": "a", "op": "in", "val": "someval"}],
-            "having": "COUNT(1) = 1",
-        }
-        expected = {
-            "adhoc_filters": [
-                {"clause": "WHERE", "expressionType": "SQL", "sqlExpression": "a = 1"}
-            ]
-        }
-        convert_legacy_filters_into_adhoc(form_data)
-        self.assertEqual(form_data, expected)
-
     def test_parse_js_uri_path_items_eval_undefined(self):
-        self.assertIsNone(parse_js_uri_path_item("undefined", eval_undefined=True))
-        self.assertIsNone(parse_js_uri_path_item("null", eval_undefined=True))
-        self.assertEqual("undefined", parse_js_uri_path_item("undefined"))
-        self.assertEqual("null", parse_js_uri_path_item("null"))
+        assert parse_js_uri_path_item("undefined", eval_undefined=True) is None
+        assert parse_js_uri_path_item("null", eval_undefined=True) is None
+        assert parse_js_uri_path_item("undefined") == "undefined"
+        assert parse_js_uri_path_item("null") == "null"
 
     def test_parse_js_uri_path_items_unquote(self):
-        self.assertEqual("slashed/name", parse_js_uri_path_item("slashed%2fname"))
-        self.assertEqual(
-            "slashed%2fname", parse_js_uri_path_item("slashed%2fname", unquote=False)
+        assert parse_js_uri_path_item("slashed%2fname") == "slashed/name"
+        assert (
+            parse_js_uri_path_item("slashed%2fname", unquote=False) == "slashed%2fname"
         )
 
     def test_parse_js_uri_path_items_item_optional(self):
-        self.assertIsNone(parse_js_uri_path_item(None))
-        self.assertIsNotNone(parse_js_uri_path_item("item"))
+        assert parse_js_uri_path_item(None) is None
+        assert parse_js_uri_path_item("item") is not None
 
     def test_get_stacktrace(self):
         with app.app_context():
@@ -691,7 +655,7 @@ class TestUtils(SupersetTestCase):
                 raise Exception("NONONO!")
             except Exception:
                 stacktrace = get_stacktrace()
-                self.assertIn("NONONO", stacktrace)
+                assert "NONONO" in stacktrace
 
             app.config["SHOW_STACKTRACE"] = False
             try:
@@ -700,63 +664,19 @@ class TestUtils(SupersetTestCase):
                 stacktrace = get_stacktrace()
                 assert stacktrace is None
 
-    def test_split(self):
-        self.assertEqual(list(split("a b")), ["a", "b"])
-        self.assertEqual(list(split("a,b", delimiter=",")), ["a", "b"])
-        self.assertEqual(list(split("a,(b,a)", delimiter=",")), ["a", "(b,a)"])
-        self.assertEqual(
-            list(split('a,(b,a),"foo , bar"', delimiter=",")),
-            ["a", "(b,a)", '"foo , bar"'],
-        )
-        self.assertEqual(
-            list(split("a,'b,c'", delimiter=",", quote="'")), ["a", "'b,c'"]
-        )
-        self.assertEqual(list(split('a "b c"')), ["a", '"b c"'])
-        self.assertEqual(list(split(r'a "b \" c"')), ["a", r'"b \" c"'])
-
-    def test_get_or_create_db(self):
-        get_or_create_db("test_db", "sqlite:///superset.db")
-        database = db.session.query(Database).filter_by(database_name="test_db").one()
-        self.assertIsNotNone(database)
-        self.assertEqual(database.sqlalchemy_uri, "sqlite:///superset.db")
-        self.assertIsNotNone(
-            security_manager.find_permission_view_menu("database_access", database.perm)
-        )
-        # Test change URI
-        get_or_create_db("test_db", "sqlite:///changed.db")
-        database = db.session.query(Database).filter_by(database_name="test_db").one()
-        self.assertEqual(database.sqlalchemy_uri, "sqlite:///changed.db")
-        db.session.delete(database)
-        db.session.commit()
-
     def test_get_or_create_db_invalid_uri(self):
-        with self.assertRaises(DatabaseInvalidError):
+        with pytest.raises(DatabaseInvalidError):
             get_or_create_db("test_db", "yoursql:superset.db/()")
 
-    def test_get_or_create_db_existing_invalid_uri(self):
-        database = get_or_create_db("test_db", "sqlite:///superset.db")
-        database.sqlalchemy_uri = "None"
-        db.session.commit()
-        database = get_or_create_db("test_db", "sqlite:///superset.db")
-        assert database.sqlalchemy_uri == "sqlite:///superset.db"
-
-    def test_as_list(self):
-        self.assertListEqual(as_list(123), [123])
-        self.assertListEqual(as_list([123]), [123])
-        self.assertListEqual(as_list("foo"), ["foo"])
-
     def test_merge_extra_filters_with_no_extras(self):
         form_data = {
             "time_range": "Last 10 days",
         }
         merge_extra_form_data(form_data)
-        self.assertEqual(
-            form_data,
-            {
-                "time_range": "Last 10 days",
-                "adhoc_filters": [],
-            },
-        )
+        assert form_data == {
+            "time_range": "Last 10 days",
+            "adhoc_filters": [],
+        }
 
     def test_merge_extra_filters_with_unset_legacy_time_range(self):
         """
@@ -770,14 +690,11 @@ class TestUtils(SupersetTestCase):
             "extra_form_data": {"time_range": "Last year"},
         }
         merge_extra_filters(form_data)
-        self.assertEqual(
-            form_data,
-            {
-                "time_range": "Last year",
-                "applied_time_extras": {},
-                "adhoc_filters": [],
-            },
-        )
+        assert form_data == {
+            "time_range": "Last year",
+            "applied_time_extras": {},
+            "adhoc_filters": [],
+        }
 
     def test_merge_extra_filters_with_extras(self):
         form_data = {
@@ -819,177 +736,12 @@ class TestUtils(SupersetTestCase):
         assert form_data["extras"]["relative_start"] == "now"
 
     def test_ssl_certificate_parse(self):
-        parsed_certificate = parse_ssl_cert(ssl_certificate)
-        self.assertEqual(parsed_certificate.serial_number, 12355228710836649848)
+        assert PARSED_SSL_CERTIFICATE.serial_number == 12355228710836649848
 
     def test_ssl_certificate_file_creation(self):
         path = create_ssl_cert_file(ssl_certificate)
-        expected_filename = md5_sha_from_str(ssl_certificate)
-        self.assertIn(expected_filename, path)
-        self.assertTrue(os.path.exists(path))
-
-    def test_get_email_address_list(self):
-        self.assertEqual(get_email_address_list("a@a"), ["a@a"])
-        self.assertEqual(get_email_address_list(" a@a "), ["a@a"])
-        self.assertEqual(get_email_address_list("a@a\n"), ["a@a"])
-        self.assertEqual(get_email_address_list(",a@a;"), ["a@a"])
-        self.assertEqual(
-            get_email_address_list(",a@a; b@b c@c a-c@c; d@d, f@f"),
-            ["a@a", "b@b", "c@c", "a-c@c", "d@d", "f@f"],
-        )
-
-    def test_get_form_data_default(self) -> None:
-        with app.test_request_context():
-            form_data, slc = get_form_data()
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_request_args(self) -> None:
-        with app.test_request_context(
-            query_string={"form_data": json.dumps({"foo": "bar"})}
-        ):
-            form_data, slc = get_form_data()
-            self.assertEqual(form_data, {"foo": "bar"})
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_request_form(self) -> None:
-        with app.test_request_context(data={"form_data": json.dumps({"foo": "bar"})}):
-            form_data, slc = get_form_data()
-            self.assertEqual(form_data, {"foo": "bar"})
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_request_form_with_queries(self) -> None:
-        # the CSV export uses for requests, even when sending requests to
-        # /api/v1/chart/data
-        with app.test_request_context(
-            data={
-                "form_data": json.dumps({"queries": [{"url_params": {"foo": "bar"}}]})
-            }
-        ):
-            form_data, slc = get_form_data()
-            self.assertEqual(form_data, {"url_params": {"foo": "bar"}})
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_request_args_and_form(self) -> None:
-        with app.test_request_context(
-            data={"form_data": json.dumps({"foo": "bar"})},
-            query_string={"form_data": json.dumps({"baz": "bar"})},
-        ):
-            form_data, slc = get_form_data()
-            self.assertEqual(form_data, {"baz": "bar", "foo": "bar"})
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_globals(self) -> None:
-        with app.test_request_context():
-            g.form_data = {"foo": "bar"}
-            form_data, slc = get_form_data()
-            delattr(g, "form_data")
-            self.assertEqual(form_data, {"foo": "bar"})
-            self.assertEqual(slc, None)
-
-    def test_get_form_data_corrupted_json(self) -> None:
-        with app.test_request_context(
-            data={"form_data": "{x: '2324'}"},
-            query_string={"form_data": '{"baz": "bar"'},
-        ):
-            form_data, slc = get_form_data()
-            self.assertEqual(form_data, {})
-            self.assertEqual(slc, None)
-
-    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
-    def test_log_this(self) -> None:
-        # TODO: Add additional scenarios.
-        self.login(ADMIN_USERNAME)
-        slc = self.get_slice("Top 10 Girl Name Share")
-        dashboard_id = 1
-
-        assert slc.viz is not None
-        resp = self.get_json_resp(
-            f"/superset/explore_json/{slc.datasource_type}/{slc.datasource_id}/"
-            + f'?form_data={{"slice_id": {slc.id}}}&dashboard_id={dashboard_id}',
-            {"form_data": json.dumps(slc.viz.form_data)},
-        )
-
-        record = (
-            db.session.query(Log)
-            .filter_by(action="explore_json", slice_id=slc.id)
-            .order_by(Log.dttm.desc())
-            .first()
-        )
-
-        self.assertEqual(record.dashboard_id, dashboard_id)
-        self.assertEqual(json.loads(record.json)["dashboard_id"], str(dashboard_id))
-        self.assertEqual(json.loads(record.json)["form_data"]["slice_id"], slc.id)
-
-        self.assertEqual(
-            json.loads(record.json)["form_data"]["viz_type"],
-            slc.viz.form_data["viz_type"],
-        )
-
-    def test_schema_validate_json(self):
-        valid = '{"a": 5, "b": [1, 5, ["g", "h"]]}'
-        self.assertIsNone(schema.validate_json(valid))
-        invalid = '{"a": 5, "b": [1, 5, ["g", "h]]}'
-        self.assertRaises(marshmallow.ValidationError, schema.validate_json, invalid)
-
-    def test_schema_one_of_case_insensitive(self):
-        validator = schema.OneOfCaseInsensitive(choices=[1, 2, 3, "FoO", "BAR", "baz"])
-        self.assertEqual(1, validator(1))
-        self.assertEqual(2, validator(2))
-        self.assertEqual("FoO", validator("FoO"))
-        self.assertEqual("FOO", validator("FOO"))
-        self.assertEqual("bar", validator("bar"))
-        self.assertEqual("BaZ", validator("BaZ"))
-        self.assertRaises(marshmallow.ValidationError, validator, "qwerty")
-        self.assertRaises(marshmallow.ValidationError, validator, 4)
-
-    def test_cast_to_num(self) -> None:
-        assert cast_to_num("5") == 5
-        assert cast_to_num("5.2") == 5.2
-        assert cast_to_num(10) == 10
-        assert cast_to_num(10.1) == 10.1
-        assert cast_to_num(None) is None
-        assert cast_to_num("this is not a string") is None
-
-    def test_get_form_data_token(self):
-        assert get_form_data_token({"token": "token_abcdefg1"}) == "token_abcdefg1"
-        generated_token = get_form_data_token({})
-        assert re.match(r"^token_[a-z0-9]{8}$", generated_token) is not None
-
-    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
-    def test_extract_dataframe_dtypes(self):
-        slc = self.get_slice("Girls")
-        cols: tuple[tuple[str, GenericDataType, list[Any]], ...] = (
-            ("dt", GenericDataType.TEMPORAL, [date(2021, 2, 4), date(2021, 2, 4)]),
-            (
-                "dttm",
-                GenericDataType.TEMPORAL,
-                [datetime(2021, 2, 4, 1, 1, 1), datetime(2021, 2, 4, 1, 1, 1)],
-            ),
-            ("str", GenericDataType.STRING, ["foo", "foo"]),
-            ("int", GenericDataType.NUMERIC, [1, 1]),
-            ("float", GenericDataType.NUMERIC, [0.5, 0.5]),
-            ("mixed-int-float", GenericDataType.NUMERIC, [0.5, 1.0]),
-            ("bool", GenericDataType.BOOLEAN, [True, False]),
-            ("mixed-str-int", GenericDataType.STRING, ["abc", 1.0]),
-            ("obj", GenericDataType.STRING, [{"a": 1}, {"a": 1}]),
-            ("dt_null", GenericDataType.TEMPORAL, [None, date(2021, 2, 4)]),
-            (
-                "dttm_null",
-                GenericDataType.TEMPORAL,
-                [None, datetime(2021, 2, 4, 1, 1, 1)],
-            ),
-            ("str_null", GenericDataType.STRING, [None, "foo"]),
-            ("int_null", GenericDataType.NUMERIC, [None, 1]),
-            ("float_null", GenericDataType.NUMERIC, [None, 0.5]),
-            ("bool_null", GenericDataType.BOOLEAN, [None, False]),
-            ("obj_null", GenericDataType.STRING, [None, {"a": 1}]),
-            # Non-timestamp columns should be identified as temporal if
-            # `is_dttm` is set to `True` in the underlying datasource
-            ("ds", GenericDataType.TEMPORAL, [None, {"ds": "2017-01-01"}]),
-        )
-
-        df = pd.DataFrame(data={col[0]: col[2] for col in cols})
-        assert extract_dataframe_dtypes(df, slc.datasource) == [col[1] for col in cols]
+        assert SSL_CERTIFICATE_FILENAME in path
+        assert os.path.exists(path)
 
     def test_normalize_dttm_col(self):
         def normalize_col(
@@ -1001,20 +753,18 @@ class TestUtils(SupersetTestCase):
             df = df.copy()
             normalize_dttm_col(
                 df,
-                tuple(
-                    [
-                        DateColumn.get_legacy_time_column(
-                            timestamp_format=timestamp_format,
-                            offset=offset,
-                            time_shift=time_shift,
-                        )
-                    ]
+                (
+                    DateColumn.get_legacy_time_column(
+                        timestamp_format=timestamp_format,
+                        offset=offset,
+                        time_shift=time_shift,
+                    ),
                 ),
             )
             return df
 
-        ts = pd.Timestamp(2021, 2, 15, 19, 0, 0, 0)
-        df = pd.DataFrame([{"__timestamp": ts, "a": 1}])
+        ts = NORMALIZE_DTTM_TIMESTAMP
+        df = NORMALIZE_DTTM_DF
 
         # test regular (non-numeric) format
         assert normalize_col(df, None, 0, None)[DTTM_ALIAS][0] == ts
@@ -1032,14 +782,150 @@ class TestUtils(SupersetTestCase):
         )
 
         # test numeric epoch_s format
-        df = pd.DataFrame([{"__timestamp": ts.timestamp(), "a": 1}])
+        df = NORMALIZE_DTTM_EPOCH_S_DF
         assert normalize_col(df, "epoch_s", 0, None)[DTTM_ALIAS][0] == ts
 
         # test numeric epoch_ms format
-        df = pd.DataFrame([{"__timestamp": ts.timestamp() * 1000, "a": 1}])
+        df = NORMALIZE_DTTM_EPOCH_MS_DF
         assert normalize_col(df, "epoch_ms", 0, None)[DTTM_ALIAS][0] == ts
 
         # test that we raise an error when we can't convert
-        df = pd.DataFrame([{"__timestamp": "1677-09-21 00:00:00", "a": 1}])
+        df = NORMALIZE_DTTM_OUT_OF_BOUNDS_DF
         with pytest.raises(pd.errors.OutOfBoundsDatetime):
             normalize_col(df, None, 0, None)
+
+
+@pytest.mark.parametrize(
+    "data,query_string,globals_form_data,expected",
+    [
+        (None, None, None, {}),
+        (None, {"form_data": FORM_DATA_FOO}, None, {"foo": "bar"}),
+        ({"form_data": FORM_DATA_FOO}, None, None, {"foo": "bar"}),
+        # the CSV export uses for requests, even when sending requests to
+        # /api/v1/chart/data
+        (
+            {"form_data": FORM_DATA_QUERIES},
+            None,
+            None,
+            {"url_params": {"foo": "bar"}},
+        ),
+        (
+            {"form_data": FORM_DATA_FOO},
+            {"form_data": FORM_DATA_BAZ},
+            None,
+            {"baz": "bar", "foo": "bar"},
+        ),
+        (None, None, {"foo": "bar"}, {"foo": "bar"}),
+        (
+            {"form_data": "{x: '2324'}"},
+            {"form_data": '{"baz": "bar"'},
+            None,
+            {},
+        ),
+    ],
+    ids=[
+        "default",
+        "request_args",
+        "request_form",
+        "request_form_with_queries",
+        "request_args_and_form",
+        "globals",
+        "corrupted_json",
+    ],
+)
+def test_get_form_data(
+    app_context: AppContext,
+    data: Optional[dict[str, str]],
+    query_string: Optional[dict[str, str]],
+    globals_form_data: Optional[dict[str, Any]],
+    expected: dict[str, Any],
+) -> None:
+    with app.test_request_context(data=data, query_string=query_string):
+        if globals_form_data is not None:
+            g.form_data = globals_form_data
+        try:
+            form_data, slc = get_form_data()
+        finally:
+            # `g` belongs to the shared app context, so it outlives the request
+            g.pop("form_data", None)
+
+    assert form_data == expected
+    assert slc is None
+
+
+@pytest.fixture
+def cleanup_test_db(app_context: AppContext) -> Iterator[None]:
+    """
+    Remove the `test_db` database created by a test, along with its permissions.
+    """
+    yield
+
+    if database := (
+        db.session.query(Database).filter_by(database_name="test_db").one_or_none()
+    ):
+        db.session.delete(database)
+        db.session.commit()
+
+
+@pytest.mark.usefixtures("cleanup_test_db")
+def test_get_or_create_db() -> None:
+    get_or_create_db("test_db", "sqlite:///superset.db")
+    database = db.session.query(Database).filter_by(database_name="test_db").one()
+    assert database is not None
+    assert database.sqlalchemy_uri == "sqlite:///superset.db"
+    assert (
+        security_manager.find_permission_view_menu("database_access", database.perm)
+        is not None
+    )
+    # Test change URI
+    get_or_create_db("test_db", "sqlite:///changed.db")
+    database = db.session.query(Database).filter_by(database_name="test_db").one()
+    assert database.sqlalchemy_uri == "sqlite:///changed.db"
+
+
+@pytest.mark.usefixtures("cleanup_test_db")
+def test_get_or_create_db_existing_invalid_uri() -> None:
+    database = get_or_create_db("test_db", "sqlite:///superset.db")
+    database.sqlalchemy_uri = "None"
+    db.session.commit()
+    database = get_or_create_db("test_db", "sqlite:///superset.db")
+    assert database.sqlalchemy_uri == "sqlite:///superset.db"
+
+
+@pytest.mark.usefixtures("load_birth_names_dashboard_with_slices_module_scope")
+def test_log_this(test_client: FlaskClient, login_as_admin: None) -> None:
+    # TODO: Add additional scenarios.
+    slc = db.session.query(Slice).filter_by(slice_name="Top 10 Girl Name Share").one()
+    dashboard_id = 1
+
+    viz = slc.viz
+    assert viz is not None
+    get_resp(
+        test_client,
+        f"/superset/explore_json/{slc.datasource_type}/{slc.datasource_id}/"
+        + f'?form_data={{"slice_id": {slc.id}}}&dashboard_id={dashboard_id}',
+        {"form_data": json.dumps(viz.form_data)},
+    )
+
+    record = (
+        db.session.query(Log)
+        .filter_by(action="explore_json", slice_id=slc.id)
+        .order_by(Log.dttm.desc())
+        .first()
+    )
+
+    assert record.dashboard_id == dashboard_id
+    payload = json.loads(record.json)
+    assert payload["dashboard_id"] == str(dashboard_id)
+    form_data = payload["form_data"]
+    assert form_data["slice_id"] == slc.id
+    assert form_data["viz_type"] == viz.form_data["viz_type"]
+
+
+@pytest.mark.usefixtures("load_birth_names_dashboard_with_slices_module_scope")
+def test_extract_dataframe_dtypes(app_context: AppContext) -> None:
+    slc = db.session.query(Slice).filter_by(slice_name="Girls").one()
+    assert (
+        extract_dataframe_dtypes(DATAFRAME_DTYPES_DF, slc.datasource)
+        == DATAFRAME_DTYPES_EXPECTED
+    )
@@ -0,0 +1,137 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import importlib
+import pkgutil
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+from click.utils import make_default_short_help
+from flask.cli import ScriptInfo
+from pytest_mock import MockerFixture
+
+from superset import cli
+from superset.app import SupersetApp
+from superset.cli.main import SUB_COMMANDS, SubCommand, superset
+
+
+def test_sub_commands_registry_is_complete() -> None:
+    """
+    Test that every Click command in the ``superset.cli`` package is registered.
+    """
+    discovered = {}
+    for _, module_name, _ in pkgutil.walk_packages(cli.__path__, cli.__name__ + "."):
+        if module_name == superset.callback.__module__:
+            continue
+        module = importlib.import_module(module_name)
+        commands = {
+            name: attribute
+            for name, attribute in module.__dict__.items()
+            if isinstance(attribute, click.Command)
+        }
+        nested = {
+            command
+            for group in commands.values()
+            if isinstance(group, click.Group)
+            for command in group.commands.values()
+        }
+        for name, command in commands.items():
+            if command not in nested:
+                discovered[command.name] = SubCommand(
+                    f"{module_name}:{name}",
+                    command.get_short_help_str(limit=sys.maxsize),
+                )
+                for limit in (20, 45, 80):
+                    assert make_default_short_help(
+                        discovered[command.name].short_help, limit
+                    ) == command.get_short_help_str(limit)
+
+    assert discovered == SUB_COMMANDS
+
+
+def test_get_command_imports_lazily() -> None:
+    """
+    Test that registered sub-commands are resolved from their import path.
+    """
+    from superset.cli.examples import load_examples
+
+    ctx = click.Context(superset)
+    assert superset.get_command(ctx, "load-examples") is load_examples
+    assert set(SUB_COMMANDS) <= set(superset.list_commands(ctx))
+
+
+def test_help_does_not_import_sub_commands(
+    mocker: MockerFixture,
+    app: SupersetApp,
+) -> None:
+    """
+    Test that listing the sub-commands doesn't import their modules.
+    """
+    modules = {
+        sub_command.import_path.split(":")[0] for sub_command in SUB_COMMANDS.values()
+    }
+    mocker.patch.dict(sys.modules)
+    for module in modules:
+        sys.modules.pop(module, None)
+
+    result = CliRunner().invoke(
+        superset,
+        ["--help"],
+        obj=ScriptInfo(create_app=lambda: app),
+    )
+
+    assert result.exit_code == 0
+    assert "Loads a set of Slices and Dashboards" in result.output
+    assert modules.isdisjoint(sys.modules)
+
+
+@pytest.mark.parametrize(
+    "args,help_requested",
+    [
+        (["set-database-uri", "--help"], True),
+        (["set-database-uri", "-d", "examples", "--help"], True),
+        (["set-database-uri", "-d", "examples", "-u", "sqlite://"], False),
+        # an option value that happens to look like the help option
+        (["set-database-uri", "-d", "examples", "-u", "--help"], False),
+    ],
+)
+def test_app_context_setup(
+    mocker: MockerFixture,
+    app: SupersetApp,
+    args: list[str],
+    help_requested: bool,
+) -> None:
+    """
+    Test that the app context is only set up when running a sub-command.
+    """
+    from superset.cli.update import set_database_uri
+
+    setup_app_context = mocker.patch("superset.cli.main.setup_app_context")
+    callback = mocker.patch.object(set_database_uri, "callback")
+
+    result = CliRunner().invoke(
+        superset,
+        args,
+        obj=ScriptInfo(create_app=lambda: app),
+    )
+
+    assert result.exit_code == 0
+    assert ("Usage: superset set-database-uri" in result.output) is help_requested
+    assert setup_app_context.called is not help_requested
+    assert callback.called is not help_requested
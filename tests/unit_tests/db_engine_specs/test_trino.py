@@ -19,13 +19,14 @@ import copy
 import json
 from datetime import datetime
 from typing import Any, Optional
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pandas as pd
 import pytest
 from pytest_mock import MockerFixture
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from sqlalchemy import types
+from sqlalchemy.exc import NoSuchTableError
 from trino.exceptions import TrinoExternalError, TrinoInternalError, TrinoUserError
 from trino.sqlalchemy import datatype
 
@@ -318,11 +319,55 @@ def test_extra_table_metadata() -> None:
         return_value=[{"column_names": ["ds", "hour"], "name": "partition"}]
     )
     db_mock.get_extra = Mock(return_value={})
-    db_mock.has_view_by_name = Mock(return_value=None)
     db_mock.get_df = Mock(return_value=pd.DataFrame({"ds": ["01-01-19"], "hour": [1]}))
     result = TrinoEngineSpec.extra_table_metadata(db_mock, "test_table", "test_schema")
     assert result["partitions"]["cols"] == ["ds", "hour"]
     assert result["partitions"]["latest"] == {"ds": "01-01-19", "hour": 1}
+    assert "view" not in result
+    db_mock.get_inspector_with_context.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "view_definition,expected",
+    [
+        ("SELECT 1", {"view": "SELECT 1"}),
+        (None, {}),
+    ],
+)
+def test_extra_table_metadata_view(
+    view_definition: Optional[str],
+    expected: dict[str, Any],
+) -> None:
+    from superset.db_engine_specs.trino import TrinoEngineSpec
+
+    db_mock = MagicMock()
+    db_mock.get_indexes = Mock(return_value=[])
+    inspector = db_mock.get_inspector_with_context.return_value.__enter__.return_value
+    inspector.get_view_definition.return_value = view_definition
+
+    result = TrinoEngineSpec.extra_table_metadata(db_mock, "test_table", "test_schema")
+    assert result == expected
+    inspector.get_view_definition.assert_called_once_with("test_table", "test_schema")
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [
+        NoSuchTableError("test_table"),
+        TrinoUserError({"message": "Access Denied"}),
+    ],
+)
+def test_extra_table_metadata_view_error(exception: Exception) -> None:
+    from superset.db_engine_specs.trino import TrinoEngineSpec
+
+    db_mock = MagicMock()
+    db_mock.get_indexes = Mock(return_value=[])
+    inspector = db_mock.get_inspector_with_context.return_value.__enter__.return_value
+    inspector.get_view_definition.side_effect = exception
+
+    assert (
+        TrinoEngineSpec.extra_table_metadata(db_mock, "test_table", "test_schema") == {}
+    )
 
 
 @patch("sqlalchemy.engine.Engine.connect")
@@ -333,6 +378,7 @@ def test_cancel_query_success(engine_mock: Mock) -> None:
     query = Query()
     cursor_mock = engine_mock.return_value.__enter__.return_value
     assert TrinoEngineSpec.cancel_query(cursor_mock, query, "123") is True
+    assert cursor_mock.execute.call_args[0][1] == ["123"]
 
 
 @patch("sqlalchemy.engine.Engine.connect")
@@ -395,6 +441,25 @@ def test_handle_cursor_early_cancel(
         assert cancel_query_mock.call_args is None
 
 
+def test_handle_cursor_without_query_id(mocker: MockerFixture) -> None:
+    """Test that `handle_cursor` stores a missing query ID from the cursor"""
+    from superset.db_engine_specs.trino import TrinoEngineSpec
+    from superset.models.sql_lab import Query
+
+    db_mock = mocker.patch("superset.db_engine_specs.trino.db")
+    cursor_mock = mocker.MagicMock(query_id=None, info_uri=None)
+    query = Query()
+
+    TrinoEngineSpec.handle_cursor(cursor=cursor_mock, query=query)
+
+    assert query.extra == {QUERY_CANCEL_KEY: None}
+    db_mock.session.commit.assert_called_once()
+
+    # the query isn't flagged for early cancelation once the cursor was handled
+    TrinoEngineSpec.prepare_cancel_query(query=query)
+    assert QUERY_EARLY_CANCEL_KEY not in query.extra
+
+
 def test_execute_with_cursor_in_parallel(mocker: MockerFixture):
     """Test that `execute_with_cursor` fetches query ID from the cursor"""
     from superset.db_engine_specs.trino import TrinoEngineSpec
@@ -404,7 +469,7 @@ def test_execute_with_cursor_in_parallel(mocker: MockerFixture):
     mock_cursor = mocker.MagicMock()
     mock_cursor.query_id = None
 
-    mock_query = mocker.MagicMock()
+    mock_query = mocker.MagicMock(extra={})
 
     def _mock_execute(*args, **kwargs):
         mock_cursor.query_id = query_id
@@ -417,9 +482,7 @@ def test_execute_with_cursor_in_parallel(mocker: MockerFixture):
         query=mock_query,
     )
 
-    mock_query.set_extra_json_key.assert_called_once_with(
-        key=QUERY_CANCEL_KEY, value=query_id
-    )
+    assert mock_query.extra == {QUERY_CANCEL_KEY: query_id}
 
 
 def test_get_columns(mocker: MockerFixture):
@@ -548,3 +611,4 @@ def test_get_dbapi_exception_mapping():
     assert mapping.get(TrinoExternalError) == SupersetDBAPIOperationalError
     assert mapping.get(RequestsConnectionError) == SupersetDBAPIConnectionError
     assert mapping.get(Exception) is None
+    assert TrinoEngineSpec.get_dbapi_exception_mapping() is mapping
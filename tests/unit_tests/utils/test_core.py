@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import os
+import re
 from dataclasses import dataclass
 from typing import Any, Optional
 from unittest.mock import MagicMock, patch
@@ -25,16 +26,22 @@ from sqlalchemy import CheckConstraint, Column, Integer, MetaData, Table
 
 from superset.exceptions import SupersetException
 from superset.utils.core import (
+    as_list,
     cast_to_boolean,
+    cast_to_num,
     check_is_safe_zip,
+    convert_legacy_filters_into_adhoc,
     DateColumn,
     generic_find_constraint_name,
     generic_find_fk_constraint_name,
+    get_email_address_list,
+    get_form_data_token,
     is_test,
     normalize_dttm_col,
     parse_boolean_string,
     QueryObjectFilterClause,
     remove_extra_adhoc_filters,
+    split,
 )
 
 ADHOC_FILTER: QueryObjectFilterClause = {
@@ -50,6 +57,8 @@ EXTRA_FILTER: QueryObjectFilterClause = {
     "isExtra": True,
 }
 
+FORM_DATA_TOKEN_REGEX = re.compile(r"^token_[a-z0-9]{8}\Z")
+
 
 @dataclass
 class MockZipInfo:
@@ -371,3 +380,144 @@ def test_generic_find_fk_constraint_none_exist():
     )
 
     assert result is None
+
+
+def test_split() -> None:
+    assert list(split("a b")) == ["a", "b"]
+    assert list(split("a,b", delimiter=",")) == ["a", "b"]
+    assert list(split("a,(b,a)", delimiter=",")) == ["a", "(b,a)"]
+    assert list(split('a,(b,a),"foo , bar"', delimiter=",")) == [
+        "a",
+        "(b,a)",
+        '"foo , bar"',
+    ]
+    assert list(split("a,'b,c'", delimiter=",", quote="'")) == ["a", "'b,c'"]
+    assert list(split('a "b c"')) == ["a", '"b c"']
+    assert list(split(r'a "b \" c"')) == ["a", r'"b \" c"']
+
+
+def test_as_list() -> None:
+    assert as_list(123) == [123]
+    assert as_list([123]) == [123]
+    assert as_list("foo") == ["foo"]
+
+
+def test_cast_to_num() -> None:
+    assert cast_to_num("5") == 5
+    assert cast_to_num("5.2") == 5.2
+    assert cast_to_num(10) == 10
+    assert cast_to_num(10.1) == 10.1
+    assert cast_to_num(None) is None
+    assert cast_to_num("this is not a string") is None
+
+
+def test_get_form_data_token() -> None:
+    assert get_form_data_token({"token": "token_abcdefg1"}) == "token_abcdefg1"
+    generated_token = get_form_data_token({})
+    assert FORM_DATA_TOKEN_REGEX.match(generated_token) is not None
+
+
+@pytest.mark.parametrize(
+    "form_data,expected",
+    [
+        (
+            {"where": "a = 1"},
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "expressionType": "SQL",
+                        "filterOptionName": "46fb6d7891e23596e42ae38da94a57e0",
+                        "sqlExpression": "a = 1",
+                    }
+                ]
+            },
+        ),
+        (
+            {"filters": [{"col": "a", "op": "in", "val": "someval"}]},
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "comparator": "someval",
+                        "expressionType": "SIMPLE",
+                        "filterOptionName": "135c7ee246666b840a3d7a9c3a30cf38",
+                        "operator": "in",
+                        "subject": "a",
+                    }
+                ]
+            },
+        ),
+        (
+            {"adhoc_filters": [], "where": "a = 1"},
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "expressionType": "SQL",
+                        "filterOptionName": "46fb6d7891e23596e42ae38da94a57e0",
+                        "sqlExpression": "a = 1",
+                    }
+                ]
+            },
+        ),
+        (
+            {"having": "COUNT(1) = 1"},
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "HAVING",
+                        "expressionType": "SQL",
+                        "filterOptionName": "683f1c26466ab912f75a00842e0f2f7b",
+                        "sqlExpression": "COUNT(1) = 1",
+                    }
+                ]
+            },
+        ),
+        (
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "expressionType": "SQL",
+                        "sqlExpression": "a = 1",
+                    }
+                ],
+                "filters": [{"col": "a", "op": "in", "val": "someval"}],
+                "having": "COUNT(1) = 1",
+            },
+            {
+                "adhoc_filters": [
+                    {
+                        "clause": "WHERE",
+                        "expressionType": "SQL",
+                        "sqlExpression": "a = 1",
+                    }
+                ]
+            },
+        ),
+    ],
+    ids=["where", "filters", "present_and_empty", "having", "present_and_nonempty"],
+)
+def test_convert_legacy_filters_into_adhoc(
+    form_data: dict[str, Any], expected: dict[str, Any]
+) -> None:
+    convert_legacy_filters_into_adhoc(form_data)
+    assert form_data == expected
+
+
+@pytest.mark.parametrize(
+    "address_string,expected",
+    [
+        ("a@a", ["a@a"]),
+        (" a@a ", ["a@a"]),
+        ("a@a\n", ["a@a"]),
+        (",a@a;", ["a@a"]),
+        (
+            ",a@a; b@b c@c a-c@c; d@d, f@f",
+            ["a@a", "b@b", "c@c", "a-c@c", "d@d", "f@f"],
+        ),
+    ],
+)
+def test_get_email_address_list(address_string: str, expected: list[str]) -> None:
+    assert get_email_address_list(address_string) == expected
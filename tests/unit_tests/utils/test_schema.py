@@ -0,0 +1,43 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pytest
+from marshmallow import ValidationError
+
+from superset.utils import schema
+
+
+def test_validate_json() -> None:
+    assert schema.validate_json('{"a": 5, "b": [1, 5, ["g", "h"]]}') is None
+
+    with pytest.raises(ValidationError):
+        schema.validate_json('{"a": 5, "b": [1, 5, ["g", "h]]}')
+
+
+def test_one_of_case_insensitive() -> None:
+    validator = schema.OneOfCaseInsensitive(choices=[1, 2, 3, "FoO", "BAR", "baz"])
+    assert validator(1) == 1
+    assert validator(2) == 2
+    assert validator("FoO") == "FoO"
+    assert validator("FOO") == "FOO"
+    assert validator("bar") == "bar"
+    assert validator("BaZ") == "BaZ"
+
+    with pytest.raises(ValidationError):
+        validator("qwerty")
+
+    with pytest.raises(ValidationError):
+        validator(4)